@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Dict, List, Any, Optional
 
 class MovementAnalysisRequest(BaseModel):
@@ -17,4 +17,38 @@ class RouteSafetyRequest(BaseModel):
 class HealthResponse(BaseModel):
     """Response model for health check endpoint"""
     status: str
-    service: str
\ No newline at end of file
+    service: str
+
+class MovementAnalysisResponse(BaseModel):
+    """Response model for movement pattern analysis"""
+    # Model output is passed through as-is, including any extra keys it returns.
+    # Fields filled by the model are untyped because nothing guarantees their shape.
+    model_config = ConfigDict(extra="allow")
+    
+    abnormal_speed: Any = None
+    sudden_stop: Any = None
+    route_deviation: Any = None
+    safety_concerns: Any = None
+    risk_level: Any = None
+    reasoning: Any = None
+    recommended_action: Any = None
+    is_fallback: Optional[bool] = None
+    error: Optional[str] = None
+    analysis_timestamp: Optional[str] = None
+    user_id: Optional[str] = None
+
+class RouteSafetyResponse(BaseModel):
+    """Response model for route safety evaluation"""
+    # Model output is passed through as-is, including any extra keys it returns.
+    # Fields filled by the model are untyped because nothing guarantees their shape.
+    model_config = ConfigDict(extra="allow")
+    
+    safety_score: Any = None
+    risky_segments: Any = None
+    time_of_day_concerns: Any = None
+    recommendation: Any = None
+    safe_alternative_available: Any = None
+    is_fallback: Optional[bool] = None
+    error: Optional[str] = None
+    analysis_timestamp: Optional[str] = None
+    user_id: Optional[str] = None
\ No newline at end of file
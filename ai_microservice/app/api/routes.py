@@ -1,66 +1,155 @@
-from fastapi import FastAPI, HTTPException, Depends
-from typing import Dict
+from fastapi import FastAPI, HTTPException, Depends, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.openapi.utils import validation_error_definition, validation_error_response_definition
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from pydantic import BaseModel, ValidationError
+from typing import Type
 
 from app.core.config import settings
+from app.core.http import close_http_client
 from app.core.logging import logger
-from app.api.models import MovementAnalysisRequest, RouteSafetyRequest, HealthResponse
+from app.api.models import (
+    MovementAnalysisRequest,
+    MovementAnalysisResponse,
+    RouteSafetyRequest,
+    RouteSafetyResponse,
+    HealthResponse
+)
 from app.services.movement import MovementAnalysisService
 from app.services.route_safety import RouteSafetyService
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Release shared resources when the application shuts down"""
+    yield
+    # The cached services hold Gemini clients bound to the shared connection pool,
+    # so drop them with it and let the next startup build fresh ones
+    get_movement_service.cache_clear()
+    get_route_safety_service.cache_clear()
+    await close_http_client()
+
 # Create FastAPI application
 app = FastAPI(
     title=settings.API_TITLE,
     description=settings.API_DESCRIPTION,
-    version=settings.API_VERSION
+    version=settings.API_VERSION,
+    lifespan=lifespan
 )
 
 # Service dependency injection
+# Services are built once on first use so the Gemini client and its connection pool are reused
+@lru_cache()
 def get_movement_service():
     return MovementAnalysisService()
 
+@lru_cache()
 def get_route_safety_service():
     return RouteSafetyService()
 
-@app.post("/analyze/movement", response_model=Dict)
+# Request body parsing
+def _is_json_content_type(content_type: str) -> bool:
+    """Match FastAPI's own check: a json or +json media subtype"""
+    subtype = content_type.partition(";")[0].strip().lower().partition("/")[2]
+    return subtype == "json" or subtype.endswith("+json")
+
+def json_body(model: Type[BaseModel]):
+    """Build a dependency that validates the raw request body in a single pydantic-core pass"""
+    async def parse(request: Request) -> BaseModel:
+        body = await request.body()
+        if not _is_json_content_type(request.headers.get("content-type", "")):
+            # Same error FastAPI raises when a model body arrives without a JSON content type
+            raise RequestValidationError(
+                [{
+                    "type": "model_attributes_type",
+                    "loc": ("body",),
+                    "msg": "Input should be a valid dictionary or object to extract fields from",
+                    "input": body
+                }],
+                body=body
+            )
+        try:
+            return model.model_validate_json(body)
+        except ValidationError as e:
+            errors = [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)]
+            raise RequestValidationError(errors, body=body)
+    return parse
+
+# json_body bypasses FastAPI's body handling, so its schema components are never registered
+_HTTP_VALIDATION_ERROR_SCHEMA = {
+    **validation_error_response_definition,
+    "properties": {
+        "detail": {"title": "Detail", "type": "array", "items": validation_error_definition}
+    }
+}
+
+def json_body_openapi(model: Type[BaseModel]) -> dict:
+    """Describe a json_body request and its validation error response in the OpenAPI schema"""
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": model.model_json_schema()}}
+        },
+        "responses": {
+            "422": {
+                "description": "Validation Error",
+                "content": {"application/json": {"schema": _HTTP_VALIDATION_ERROR_SCHEMA}}
+            }
+        }
+    }
+
+@app.post(
+    "/analyze/movement",
+    response_model=MovementAnalysisResponse,
+    response_model_exclude_unset=True,
+    openapi_extra=json_body_openapi(MovementAnalysisRequest)
+)
 async def analyze_movement_pattern(
-    request: MovementAnalysisRequest,
+    request: MovementAnalysisRequest = Depends(json_body(MovementAnalysisRequest)),
     service: MovementAnalysisService = Depends(get_movement_service)
 ):
     """Analyze movement patterns to detect anomalies"""
     try:
-        logger.info(f"Analyzing movement for user: {request.user_id}")
+        logger.info("Analyzing movement for user: %s", request.user_id)
         analysis_result = await service.analyze_movement(
             request.historical_data,
             request.current_data,
             request.user_id
         )
-        return analysis_result
+        # The service builds this dict itself, so skip re-validating it
+        return MovementAnalysisResponse.model_construct(**analysis_result)
         
     except Exception as e:
-        logger.error(f"Error in movement analysis: {str(e)}")
+        logger.error("Error in movement analysis: %s", e)
         raise HTTPException(status_code=500, detail=f"Analysis error: {str(e)}")
 
-@app.post("/analyze/route-safety", response_model=Dict)
+@app.post(
+    "/analyze/route-safety",
+    response_model=RouteSafetyResponse,
+    response_model_exclude_unset=True,
+    openapi_extra=json_body_openapi(RouteSafetyRequest)
+)
 async def evaluate_route_safety(
-    request: RouteSafetyRequest,
+    request: RouteSafetyRequest = Depends(json_body(RouteSafetyRequest)),
     service: RouteSafetyService = Depends(get_route_safety_service)
 ):
     """Evaluate the safety of a proposed route"""
     try:
-        logger.info(f"Analyzing route safety for user: {request.user_id}")
+        logger.info("Analyzing route safety for user: %s", request.user_id)
         safety_analysis = await service.analyze_route_safety(
             request.route_points,
             request.crime_data,
             request.time_of_day,
             request.user_id
         )
-        return safety_analysis
+        # The service builds this dict itself, so skip re-validating it
+        return RouteSafetyResponse.model_construct(**safety_analysis)
         
     except Exception as e:
-        logger.error(f"Error in route safety analysis: {str(e)}")
+        logger.error("Error in route safety analysis: %s", e)
         raise HTTPException(status_code=500, detail=f"Analysis error: {str(e)}")
 
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
     """Health check endpoint"""
-    return HealthResponse(status="healthy", service="ai-microservice")
\ No newline at end of file
+    return HealthResponse.model_construct(status="healthy", service="ai-microservice")
\ No newline at end of file
@@ -1,37 +1,60 @@
-
-import os
-from dotenv import load_dotenv
-from pydantic_settings import BaseSettings
-
-# Load environment variables from .env file
-load_dotenv()
+from functools import lru_cache
+from typing import Optional
+from dotenv import find_dotenv
+from pydantic import AliasChoices, Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
     """Application settings configuration"""
     
+    # Values come from the environment, then the nearest .env file, then the defaults below
+    model_config = SettingsConfigDict(
+        env_file=find_dotenv() or None,
+        case_sensitive=True,
+        extra="ignore",
+        frozen=True
+    )
+    
     # API Configuration
     API_TITLE: str = "Child Safety AI Microservice"
     API_DESCRIPTION: str = "AI analysis service for child safety monitoring"
     API_VERSION: str = "1.0.0"
     
     # Ollama Configuration
-    OLLAMA_BASE_URL: str = os.getenv("OLLAMA_BASE_URL", "http://127.0.0.1:11434")
-    OLLAMA_MODEL: str = os.getenv("OLLAMA_MODEL", "gemma3:1b")
-    OLLAMA_REQUEST_TIMEOUT: float = float(os.getenv("OLLAMA_REQUEST_TIMEOUT", "300.0"))
+    OLLAMA_BASE_URL: str = "http://127.0.0.1:11434"
+    OLLAMA_MODEL: str = "gemma3:1b"
+    OLLAMA_REQUEST_TIMEOUT: float = 300.0
 
+    # Outbound HTTP
+    HTTP_REQUEST_TIMEOUT: float = 300.0
+    
     # Gemini API Configuration
-    GEMINI_MODEL: str = os.getenv("GEMINI_MODEL", "gemini-2.0-flash")
-    GEMINI_API_KEY: str = os.getenv("GEMINI_API_KEY")
+    GEMINI_MODEL: str = "gemini-2.0-flash"
+    GEMINI_API_KEY: Optional[str] = None
+    GEMINI_MAX_CONCURRENCY: int = 8
+    
+    # LLM Response Cache
+    LLM_CACHE_MAXSIZE: int = 1024
+    LLM_CACHE_TTL: float = 1800
+    LLM_CACHE_MAX_TEMPERATURE: float = 0.1
+    
+    # Route Safety Fallback
+    ROUTE_SAFETY_RADIUS_METERS: float = 200
     
     # Service Configuration
-    HOST: str = os.getenv("HOST", "127.0.0.1")
-    PORT: int = int(os.getenv("AI_MICROSERVICE_PORT", "8080"))
+    HOST: str = "127.0.0.1"
+    PORT: int = Field(default=8080, validation_alias=AliasChoices("PORT", "AI_MICROSERVICE_PORT"))
+    UVICORN_LOOP: str = "auto"
+    UVICORN_HTTP: str = "auto"
+    RELOAD: bool = False
     
     # Logging
-    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
-    
-    class Config:
-        case_sensitive = True
+    LOG_LEVEL: str = "INFO"
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide settings, validated once"""
+    return Settings()
 
 # Create settings instance
-settings = Settings()
\ No newline at end of file
+settings = get_settings()
@@ -0,0 +1,25 @@
+from typing import Optional
+import httpx
+
+from app.core.config import settings
+
+# One connection pool shared by every outbound client in the process
+_http_client: Optional[httpx.AsyncClient] = None
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared HTTP/2 client, creating it on first use"""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            timeout=settings.HTTP_REQUEST_TIMEOUT
+        )
+    return _http_client
+
+async def close_http_client():
+    """Close the shared client and release its connections"""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
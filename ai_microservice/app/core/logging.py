@@ -5,6 +5,13 @@ def setup_logging():
     """Configure logging for the application"""
     log_level = getattr(logging, settings.LOG_LEVEL)
     
+    # Skip per-record thread/process lookups the format never uses
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    # Don't print tracebacks for formatting errors raised while emitting
+    logging.raiseExceptions = False
+    
     # Configure root logger
     logging.basicConfig(
         level=log_level,
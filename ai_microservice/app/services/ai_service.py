@@ -1,13 +1,80 @@
+import asyncio
 import json
-from typing import Dict, Optional
+import logging
+from typing import Awaitable, Callable, Dict, Optional
 import re
 import os
 from google import genai
 from google.genai import types
 
 from app.core.config import settings
+from app.core.http import get_http_client
 from app.core.logging import logger
-from app.utils.llm_parsers import extract_json_from_model_response
+from app.utils.llm_parsers import extract_json_from_model_response, JsonObjectScanner
+from app.utils.llm_cache import LLMCache
+
+# Shared across AIService instances so repeated prompts skip the model round-trip
+llm_cache = LLMCache(maxsize=settings.LLM_CACHE_MAXSIZE, ttl=settings.LLM_CACHE_TTL)
+
+# Caps in-flight Gemini calls across all requests to avoid provider 429s under bursts
+_GEMINI_SEMAPHORE = asyncio.Semaphore(settings.GEMINI_MAX_CONCURRENCY)
+# Deadline for waiting on a slot plus the call itself, so a stuck provider cannot hold slots forever
+_GEMINI_CALL_TIMEOUT = settings.HTTP_REQUEST_TIMEOUT
+
+# Safety settings never change between requests
+_SAFETY_SETTINGS = [
+    types.SafetySetting(
+        category="HARM_CATEGORY_HARASSMENT",
+        threshold="BLOCK_NONE"
+    ),
+    types.SafetySetting(
+        category="HARM_CATEGORY_HATE_SPEECH",
+        threshold="BLOCK_NONE"
+    ),
+    types.SafetySetting(
+        category="HARM_CATEGORY_SEXUALLY_EXPLICIT",
+        threshold="BLOCK_NONE"
+    ),
+    types.SafetySetting(
+        category="HARM_CATEGORY_DANGEROUS_CONTENT",
+        threshold="BLOCK_NONE"
+    )
+]
+
+class InFlightRequests:
+    """Shares one model call between concurrent callers making an identical request"""
+    
+    def __init__(self):
+        self._pending: Dict[str, asyncio.Future] = {}
+        
+    async def submit(self, key: str, call: Callable[[], Awaitable[Dict]]) -> Dict:
+        """
+        Start a model call, or join the one already running for the same key
+        
+        Args:
+            key: Identity of the request; concurrent callers with the same key share a single call
+            call: Zero-argument coroutine factory performing the model call
+            
+        Returns:
+            Dict: A copy of the call's result
+        """
+        future = self._pending.get(key)
+        if future is None:
+            future = asyncio.ensure_future(call())
+            self._pending[key] = future
+            future.add_done_callback(lambda done: self._forget(key, done))
+        
+        # Shield the shared call so one cancelled caller does not cancel it for the others
+        result = await asyncio.shield(future)
+        # The result is shared by every caller, each of which stamps its own metadata
+        return dict(result)
+        
+    def _forget(self, key: str, future: asyncio.Future):
+        """Drop a finished call so later requests reach the model again"""
+        if self._pending.get(key) is future:
+            del self._pending[key]
+
+_in_flight = InFlightRequests()
 
 class AIService:
     """Base service for AI model interactions using Gemini API"""
@@ -19,7 +86,15 @@ class AIService:
         if not api_key:
             raise ValueError("GEMINI_API_KEY not set in environment or configuration")
         # Initialize Google Gemini client
-        self.client = genai.Client(api_key=api_key)
+        self.client = genai.Client(
+            api_key=api_key,
+            # The SDK sets a per-request timeout that overrides the client default,
+            # so it has to be passed here as well (in milliseconds)
+            http_options=types.HttpOptions(
+                httpx_async_client=get_http_client(),
+                timeout=int(settings.HTTP_REQUEST_TIMEOUT * 1000)
+            )
+        )
         
     async def get_analysis(self, system_prompt: str, user_prompt: str, temperature: float = 0.3) -> Dict:
         """
@@ -33,49 +108,92 @@ class AIService:
         Returns:
             Dict: Parsed JSON response from the model
         """
+        cache_key = LLMCache.make_key(self.model, system_prompt, user_prompt, temperature)
+        
+        # Sampled outputs are not reproducible, so only cache near-deterministic requests
+        cacheable = temperature <= settings.LLM_CACHE_MAX_TEMPERATURE
+        if cacheable:
+            cached = await llm_cache.get(cache_key)
+            if cached is not None:
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("LLM cache hit: %s", llm_cache.stats())
+                return cached
+        
         try:
-            # Prepare the prompt with system instruction and user query
-            combined_prompt = f"{system_prompt}\n\n{user_prompt}"
-            
-            # Create configuration
-            config = types.GenerateContentConfig(
-                temperature=temperature,
-                top_p=0.95,
-                top_k=40,
-                max_output_tokens=1024,
-                safety_settings=[
-                    types.SafetySetting(
-                        category="HARM_CATEGORY_HARASSMENT",
-                        threshold="BLOCK_NONE"
-                    ),
-                    types.SafetySetting(
-                        category="HARM_CATEGORY_HATE_SPEECH",
-                        threshold="BLOCK_NONE"
-                    ),
-                    types.SafetySetting(
-                        category="HARM_CATEGORY_SEXUALLY_EXPLICIT",
-                        threshold="BLOCK_NONE"
-                    ),
-                    types.SafetySetting(
-                        category="HARM_CATEGORY_DANGEROUS_CONTENT",
-                        threshold="BLOCK_NONE"
-                    )
-                ]
-            )
+            if cacheable:
+                # Near-deterministic requests can share a concurrent identical call
+                result = await _in_flight.submit(
+                    cache_key,
+                    lambda: self._generate(system_prompt, user_prompt, temperature)
+                )
+                await llm_cache.set(cache_key, result)
+            else:
+                result = await self._generate(system_prompt, user_prompt, temperature)
             
-            # Make the request to the model
-            response = await self.client.aio.models.generate_content(
-                model=self.model,
-                contents=combined_prompt,
-                config=config
-            )
+            return result
             
-            # Extract the text content
-            content = response.text
+        except Exception as e:
+            logger.error("Error in AI analysis with Gemini: %s", e)
+            raise
             
-            # Parse the JSON response
+    async def _generate(self, system_prompt: str, user_prompt: str, temperature: float) -> Dict:
+        """Make a single Gemini request and parse its JSON output"""
+        # Keep the system prompt in system_instruction so the prefix stays byte-identical
+        # across calls and is eligible for Gemini's implicit context caching
+        config = types.GenerateContentConfig(
+            system_instruction=system_prompt,
+            temperature=temperature,
+            top_p=0.95,
+            top_k=40,
+            max_output_tokens=1024,
+            safety_settings=_SAFETY_SETTINGS
+        )
+        
+        # Stream the response and stop reading once the JSON object is complete
+        content = await self._call_with_slot(lambda: self._stream_until_json(user_prompt, config))
+        
+        # Parse the JSON response
+        try:
             return extract_json_from_model_response(content)
+        except ValueError:
+            logger.warning("Could not parse streamed response, retrying without streaming")
+            response = await self._call_with_slot(
+                lambda: self.client.aio.models.generate_content(
+                    model=self.model,
+                    contents=user_prompt,
+                    config=config
+                )
+            )
+            return extract_json_from_model_response(response.text)
             
-        except Exception as e:
-            logger.error(f"Error in AI analysis with Gemini: {str(e)}")
-            raise
\ No newline at end of file
+    async def _call_with_slot(self, call: Callable[[], Awaitable]):
+        """Run a provider call under the concurrency cap, raising TimeoutError past the deadline"""
+        async def run():
+            async with _GEMINI_SEMAPHORE:
+                return await call()
+        
+        return await asyncio.wait_for(run(), _GEMINI_CALL_TIMEOUT)
+            
+    async def _stream_until_json(self, contents: str, config: types.GenerateContentConfig) -> str:
+        """Stream model output until the first top-level JSON object closes"""
+        scanner = JsonObjectScanner()
+        parts = []
+        
+        stream = await self.client.aio.models.generate_content_stream(
+            model=self.model,
+            contents=contents,
+            config=config
+        )
+        try:
+            async for chunk in stream:
+                text = chunk.text
+                if not text:
+                    continue
+                parts.append(text)
+                if scanner.feed(text):
+                    break
+        finally:
+            # Closing early drops the remaining tokens instead of waiting for them
+            await stream.aclose()
+        
+        return "".join(parts)
\ No newline at end of file
@@ -1,9 +1,10 @@
-from typing import Dict, List, Any
-from datetime import datetime
+from typing import Dict, List, Any, Optional
+import numpy as np
 
 from app.core.logging import logger
 from app.services.ai_service import AIService
-from app.utils.prompts import construct_movement_analysis_prompt
+from app.utils.timestamps import utc_timestamp
+from app.utils.prompts import construct_movement_analysis_prompt, MOVEMENT_SYSTEM_PROMPT
 
 class MovementAnalysisService:
     """Service for analyzing movement patterns"""
@@ -28,43 +29,50 @@ class MovementAnalysisService:
         Returns:
             Dict: Analysis results with risk assessment
         """
+        # One timestamp per request, shared by the AI and fallback paths
+        analysis_timestamp = utc_timestamp()
+        
         try:
             # Create prompt for AI analysis
             prompt = construct_movement_analysis_prompt(historical_data, current_data)
             
             # Get analysis from AI model
-            system_prompt = "You are an AI specialized in analyzing GPS movements to detect potential safety issues for children."
-            analysis_result = await self.ai_service.get_analysis(system_prompt, prompt, temperature=0.2)
-            
-            # Add metadata
-            analysis_result["analysis_timestamp"] = datetime.utcnow().isoformat()
-            analysis_result["user_id"] = user_id
+            analysis_result = await self.ai_service.get_analysis(MOVEMENT_SYSTEM_PROMPT, prompt, temperature=0.1)
             
-            return analysis_result
+            # Add metadata on a new dict so the model result itself is never mutated
+            return {
+                **analysis_result,
+                "analysis_timestamp": analysis_timestamp,
+                "user_id": user_id
+            }
             
         except Exception as e:
-            logger.error(f"Error in movement analysis: {str(e)}")
+            logger.error("Error in movement analysis: %s", e)
             # Fallback to simple rules-based analysis
-            return self._fallback_movement_analysis(historical_data, current_data, user_id)
+            return self._fallback_movement_analysis(historical_data, current_data, user_id, analysis_timestamp)
             
     def _fallback_movement_analysis(
         self,
         historical_data: List[Dict],
         current_data: Dict,
-        user_id: str
+        user_id: str,
+        analysis_timestamp: Optional[str] = None
     ) -> Dict:
         """Simple rule-based analysis as fallback when AI analysis fails"""
+        analysis_timestamp = analysis_timestamp or utc_timestamp()
         try:
             # Extract current speed
             current_speed = current_data.get("speed", 0)
             
-            # Get historical speeds
-            historical_speeds = [point.get("speed", 0) for point in historical_data 
-                                if point.get("speed") is not None]
+            # Get historical speeds as a single array
+            historical_speeds = np.fromiter(
+                (point["speed"] for point in historical_data if point.get("speed") is not None),
+                dtype=np.float64
+            )
             
             # Calculate average and max historical speed
-            avg_speed = sum(historical_speeds) / len(historical_speeds) if historical_speeds else 0
-            max_speed = max(historical_speeds) if historical_speeds else 0
+            avg_speed = float(historical_speeds.mean()) if historical_speeds.size else 0
+            max_speed = float(historical_speeds.max()) if historical_speeds.size else 0
             
             # Check for abnormal speed
             abnormal_speed = current_speed > max_speed * 1.2 or current_speed > avg_speed * 1.5
@@ -81,11 +89,11 @@ class MovementAnalysisService:
                 "reasoning": "Fallback analysis: Speed analysis only",
                 "recommended_action": "Monitor speed" if abnormal_speed else "No action needed",
                 "is_fallback": True,
-                "analysis_timestamp": datetime.utcnow().isoformat(),
+                "analysis_timestamp": analysis_timestamp,
                 "user_id": user_id
             }
         except Exception as e:
-            logger.error(f"Error in fallback analysis: {str(e)}")
+            logger.error("Error in fallback analysis: %s", e)
             return {
                 "abnormal_speed": False,
                 "sudden_stop": False,
@@ -96,6 +104,6 @@ class MovementAnalysisService:
                 "recommended_action": "Check system logs",
                 "is_fallback": True,
                 "error": str(e),
-                "analysis_timestamp": datetime.utcnow().isoformat(),
+                "analysis_timestamp": analysis_timestamp,
                 "user_id": user_id
             }
\ No newline at end of file
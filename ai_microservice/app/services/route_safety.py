@@ -1,9 +1,12 @@
-from typing import Dict, List, Any
-from datetime import datetime
+from typing import Dict, List, Any, Optional
+import numpy as np
 
+from app.core.config import settings
 from app.core.logging import logger
 from app.services.ai_service import AIService
-from app.utils.prompts import construct_route_safety_prompt
+from app.utils.geo import incidents_near_route
+from app.utils.timestamps import utc_timestamp
+from app.utils.prompts import construct_route_safety_prompt, ROUTE_SAFETY_SYSTEM_PROMPT
 
 class RouteSafetyService:
     """Service for evaluating route safety"""
@@ -30,36 +33,43 @@ class RouteSafetyService:
         Returns:
             Dict: Safety analysis results
         """
+        # One timestamp per request, shared by the AI and fallback paths
+        analysis_timestamp = utc_timestamp()
+        
         try:
             # Create prompt for AI analysis
             prompt = construct_route_safety_prompt(route_points, crime_data, time_of_day)
             
             # Get analysis from AI model
-            system_prompt = "You are an AI specialized in route safety analysis for children."
-            safety_analysis = await self.ai_service.get_analysis(system_prompt, prompt, temperature=0.3)
-            
-            # Add metadata
-            safety_analysis["analysis_timestamp"] = datetime.utcnow().isoformat()
-            safety_analysis["user_id"] = user_id
+            safety_analysis = await self.ai_service.get_analysis(ROUTE_SAFETY_SYSTEM_PROMPT, prompt, temperature=0.1)
             
-            return safety_analysis
+            # Add metadata on a new dict so the model result itself is never mutated
+            return {
+                **safety_analysis,
+                "analysis_timestamp": analysis_timestamp,
+                "user_id": user_id
+            }
             
         except Exception as e:
-            logger.error(f"Error in route safety analysis: {str(e)}")
+            logger.error("Error in route safety analysis: %s", e)
             # Fallback to simple rules-based analysis
-            return self._fallback_route_safety(route_points, crime_data, time_of_day, user_id)
+            return self._fallback_route_safety(route_points, crime_data, time_of_day, user_id, analysis_timestamp)
             
     def _fallback_route_safety(
         self,
         route_points: List[Dict],
         crime_data: List[Dict],
         time_of_day: str,
-        user_id: str
+        user_id: str,
+        analysis_timestamp: Optional[str] = None
     ) -> Dict:
         """Simple rule-based safety analysis as fallback"""
+        analysis_timestamp = analysis_timestamp or utc_timestamp()
         try:
-            # Count nearby crime incidents
-            crime_count = len(crime_data)
+            # Count crime incidents within range of the route
+            radius = settings.ROUTE_SAFETY_RADIUS_METERS
+            point_counts, near_route = incidents_near_route(route_points, crime_data, radius)
+            crime_count = int(near_route.sum())
             
             # Basic safety score based on crime count
             safety_score = max(10 - crime_count, 1) if crime_count < 10 else 1
@@ -73,16 +83,16 @@ class RouteSafetyService:
             
             return {
                 "safety_score": safety_score,
-                "risky_segments": [],  # Cannot determine specific segments in fallback
+                "risky_segments": self._risky_segments(point_counts, radius),
                 "time_of_day_concerns": time_concerns,
                 "recommendation": "Consider daytime travel" if time_concerns else "Route appears acceptable",
                 "safe_alternative_available": False,
                 "is_fallback": True,
-                "analysis_timestamp": datetime.utcnow().isoformat(),
+                "analysis_timestamp": analysis_timestamp,
                 "user_id": user_id
             }
         except Exception as e:
-            logger.error(f"Error in fallback route safety: {str(e)}")
+            logger.error("Error in fallback route safety: %s", e)
             return {
                 "safety_score": 5,  # Neutral score
                 "risky_segments": [],
@@ -91,6 +101,25 @@ class RouteSafetyService:
                 "safe_alternative_available": False,
                 "is_fallback": True,
                 "error": str(e),
-                "analysis_timestamp": datetime.utcnow().isoformat(),
+                "analysis_timestamp": analysis_timestamp,
                 "user_id": user_id
-            }
\ No newline at end of file
+            }
+            
+    def _risky_segments(self, point_counts: np.ndarray, radius: float) -> List[Dict]:
+        """Group consecutive route points with nearby incidents into risky segments"""
+        segments = []
+        risky = np.flatnonzero(point_counts)
+        if not risky.size:
+            return segments
+        
+        # Split the risky indices wherever the run of consecutive points breaks
+        runs = np.split(risky, np.flatnonzero(np.diff(risky) > 1) + 1)
+        for run in runs:
+            peak = int(point_counts[run].max())
+            segments.append({
+                "start_index": int(run[0]),
+                "end_index": int(run[-1]),
+                "risk_level": min(3 + peak, 10),
+                "reasons": [f"{peak} reported incident(s) within {radius:g} m"]
+            })
+        return segments
\ No newline at end of file
@@ -0,0 +1,73 @@
+from typing import Dict, List, Tuple
+import numpy as np
+
+EARTH_RADIUS_METERS = 6371000.0
+# Meters spanned by one degree of latitude
+METERS_PER_DEGREE = EARTH_RADIUS_METERS * np.pi / 180
+
+def _coordinates(points: List[Dict]) -> np.ndarray:
+    """Return an (n, 2) array of latitude/longitude, NaN where a point has no coordinates"""
+    return np.array(
+        [
+            (point.get("latitude"), point.get("longitude"))
+            if point.get("latitude") is not None and point.get("longitude") is not None
+            else (np.nan, np.nan)
+            for point in points
+        ],
+        dtype=np.float64
+    ).reshape(-1, 2)
+
+def haversine_meters(lat: float, lon: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """Great-circle distance in meters from one point to an array of points"""
+    lat1, lon1 = np.radians(lat), np.radians(lon)
+    lat2, lon2 = np.radians(lats), np.radians(lons)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_METERS * np.arcsin(np.sqrt(a))
+
+def incidents_near_route(
+    route_points: List[Dict],
+    incidents: List[Dict],
+    radius_meters: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Match incidents to the route points they lie within radius_meters of
+    
+    Incidents are sorted by latitude once so each route point only measures
+    distances to the incidents inside its latitude band.
+    
+    Args:
+        route_points: Points forming the route, with latitude/longitude keys
+        incidents: Incident records, with latitude/longitude keys
+        radius_meters: Search radius around each route point
+        
+    Returns:
+        Tuple of per-route-point incident counts and a mask of incidents near any route point.
+        Incidents without coordinates cannot be ruled out, so they are always marked as near.
+    """
+    route = _coordinates(route_points)
+    counts = np.zeros(len(route), dtype=np.int64)
+    
+    incident_coords = _coordinates(incidents)
+    unlocated = np.isnan(incident_coords[:, 0])
+    near_route = unlocated.copy()
+    located = np.flatnonzero(~unlocated)
+    if not located.size:
+        return counts, near_route
+    
+    order = located[np.argsort(incident_coords[located, 0])]
+    sorted_lats = incident_coords[order, 0]
+    sorted_lons = incident_coords[order, 1]
+    
+    band = radius_meters / METERS_PER_DEGREE
+    lows = np.searchsorted(sorted_lats, route[:, 0] - band, side="left")
+    highs = np.searchsorted(sorted_lats, route[:, 0] + band, side="right")
+    
+    for index, (lat, lon) in enumerate(route):
+        low, high = lows[index], highs[index]
+        if np.isnan(lat) or low == high:
+            continue
+        within = haversine_meters(lat, lon, sorted_lats[low:high], sorted_lons[low:high]) <= radius_meters
+        counts[index] = int(within.sum())
+        near_route[order[low:high][within]] = True
+    
+    return counts, near_route
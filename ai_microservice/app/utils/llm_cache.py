@@ -0,0 +1,53 @@
+import asyncio
+import hashlib
+from typing import Dict, Optional
+
+from cachetools import TTLCache
+
+class LLMCache:
+    """In-process TTL + LRU cache for parsed model responses"""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 1800):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = asyncio.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def make_key(model: str, system_prompt: str, user_prompt: str, temperature: float) -> str:
+        """Build a stable cache key for a model request"""
+        raw = f"{model}|{temperature}|{system_prompt}|{user_prompt}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    async def get(self, key: str) -> Optional[Dict]:
+        """Return a copy of the cached response, or None on a miss"""
+        async with self._lock:
+            result = self._cache.get(key)
+            if result is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+        # Callers stamp metadata onto the result, so never hand out the cached dict itself
+        return dict(result)
+
+    async def set(self, key: str, result: Dict) -> None:
+        """Store a copy of a parsed response"""
+        async with self._lock:
+            self._cache[key] = dict(result)
+
+    def clear(self) -> None:
+        """Drop all cached entries and reset counters"""
+        self._cache.clear()
+        self._hits = 0
+        self._misses = 0
+
+    def stats(self) -> Dict:
+        """Return hit/miss counters for logging"""
+        lookups = self._hits + self._misses
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "size": len(self._cache),
+            "maxsize": self._cache.maxsize,
+            "hit_rate": self._hits / lookups if lookups else 0.0
+        }
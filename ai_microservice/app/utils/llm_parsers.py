@@ -1,23 +1,85 @@
 import re
-import json
+import orjson
+from typing import Optional
+
+# Compiled once at import so the hot path only runs the matcher
+_THINK_RE = re.compile(r'<think>[\s\S]*?</think>')
+_JSON_BLOCK_RE = re.compile(r'```json\s*([\s\S]*?)\s*```')
 
 # Extracting JSON from Model Response
 def extract_json_from_model_response(response_text):
     """Extract only the JSON object from a response containing thinking tags"""
     
-    # Remove <think>...</think> section
-    without_thinking = re.sub(r'<think>[\s\S]*?</think>', '', response_text).strip()
+    # Remove <think>...</think> section, skipping the regex for models that never emit it
+    if '<think>' in response_text:
+        without_thinking = _THINK_RE.sub('', response_text).strip()
+    else:
+        without_thinking = response_text.strip()
     
     # Extract JSON from code block
-    json_match = re.search(r'```json\s*([\s\S]*?)\s*```', without_thinking)
+    json_match = _JSON_BLOCK_RE.search(without_thinking)
     if json_match:
         json_str = json_match.group(1).strip()
-        return json.loads(json_str)
+        return orjson.loads(json_str)
     
     # Fallback: try to find any JSON-like object
-    json_match = re.search(r'(\{[\s\S]*\})', without_thinking)
-    if json_match:
-        json_str = json_match.group(1).strip()
-        return json.loads(json_str)
+    json_str = _find_json_object(without_thinking)
+    if json_str is not None:
+        return orjson.loads(json_str)
+        
+    raise ValueError("No JSON object found in response")
+
+
+class JsonObjectScanner:
+    """Track brace depth over (possibly streamed) text to find the first complete JSON object"""
+    
+    def __init__(self):
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.start = None
+        self.end = None
+        self._offset = 0
+        
+    @property
+    def complete(self) -> bool:
+        return self.end is not None
+        
+    def feed(self, text: str) -> bool:
+        """Consume the next chunk of text, returning True once the first object has closed"""
+        if self.complete:
+            return True
         
-    raise ValueError("No JSON object found in response")
\ No newline at end of file
+        for index, char in enumerate(text, self._offset):
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == '\\':
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '{':
+                if self.start is None:
+                    self.start = index
+                self.depth += 1
+            elif self.start is None:
+                # Prose before the object may contain stray quotes, so ignore it entirely
+                continue
+            elif char == '"':
+                self.in_string = True
+            elif char == '}':
+                self.depth -= 1
+                if self.depth == 0:
+                    self.end = index
+                    return True
+        
+        self._offset += len(text)
+        return False
+
+
+def _find_json_object(text: str) -> Optional[str]:
+    """Return the first balanced {...} object in text using a single forward scan"""
+    scanner = JsonObjectScanner()
+    if scanner.feed(text):
+        return text[scanner.start:scanner.end + 1]
+    return None
@@ -1,13 +1,23 @@
-import json
+import orjson
 from typing import List, Dict
 
-def construct_movement_analysis_prompt(historical_data: List[Dict], current_data: Dict) -> str:
-    """Create a detailed prompt for movement analysis"""
-    return f"""
+# System prompts are kept constant so the provider can reuse the cached prefix
+MOVEMENT_SYSTEM_PROMPT = "You are an AI specialized in analyzing GPS movements to detect potential safety issues for children."
+ROUTE_SAFETY_SYSTEM_PROMPT = "You are an AI specialized in route safety analysis for children."
+
+def _to_json(data) -> str:
+    """Serialize prompt data compactly with orjson"""
+    return orjson.dumps(data).decode()
+
+# Constant prompt text, split around the variable parts so each call only joins them
+_MOVEMENT_TEMPLATE = (
+    """
     Analyze the following movement data for safety concerns:
     
-    Historical movement data: {json.dumps(historical_data)}
-    Current movement data: {json.dumps(current_data)}
+    Historical movement data: """,
+    """
+    Current movement data: """,
+    """
     
     Please analyze for:
     1. Abnormal speed (higher than typical patterns)
@@ -16,7 +26,7 @@ def construct_movement_analysis_prompt(historical_data: List[Dict], current_data
     4. Any patterns that might indicate safety concerns
     
     Your response must be a single valid JSON object with the following structure:
-    {{
+    {
         "abnormal_speed": true/false,
         "sudden_stop": true/false,
         "route_deviation": true/false,
@@ -24,19 +34,22 @@ def construct_movement_analysis_prompt(historical_data: List[Dict], current_data
         "risk_level": 1-10,
         "reasoning": "Your detailed reasoning here",
         "recommended_action": "Suggested next steps if any"
-    }}
+    }
     
     Ensure your response is properly formatted JSON that can be parsed.
     """
+)
 
-def construct_route_safety_prompt(route_points: List[Dict], crime_data: List[Dict], time_of_day: str) -> str:
-    """Create a detailed prompt for route safety analysis"""
-    return f"""
+_ROUTE_SAFETY_TEMPLATE = (
+    """
     Analyze the safety of the following route:
     
-    Route points: {json.dumps(route_points)}
-    Crime data near route: {json.dumps(crime_data)}
-    Time of day: {time_of_day}
+    Route points: """,
+    """
+    Crime data near route: """,
+    """
+    Time of day: """,
+    """
     
     Please analyze for:
     1. Overall route safety
@@ -45,20 +58,43 @@ def construct_route_safety_prompt(route_points: List[Dict], crime_data: List[Dic
     4. Recommended alternatives if necessary
     
     Your response must be a single valid JSON object with the following structure:
-    {{
+    {
         "safety_score": 1-10,
         "risky_segments": [
-            {{
+            {
                 "start_index": int,
                 "end_index": int,
                 "risk_level": 1-10,
                 "reasons": ["reason1", "reason2"]
-            }}
+            }
         ],
         "time_of_day_concerns": true/false,
         "recommendation": "Your recommendation here",
         "safe_alternative_available": true/false
-    }}
+    }
     
     Ensure your response is properly formatted JSON that can be parsed.
-    """
\ No newline at end of file
+    """
+)
+
+def construct_movement_analysis_prompt(historical_data: List[Dict], current_data: Dict) -> str:
+    """Create a detailed prompt for movement analysis"""
+    return "".join((
+        _MOVEMENT_TEMPLATE[0],
+        _to_json(historical_data),
+        _MOVEMENT_TEMPLATE[1],
+        _to_json(current_data),
+        _MOVEMENT_TEMPLATE[2]
+    ))
+
+def construct_route_safety_prompt(route_points: List[Dict], crime_data: List[Dict], time_of_day: str) -> str:
+    """Create a detailed prompt for route safety analysis"""
+    return "".join((
+        _ROUTE_SAFETY_TEMPLATE[0],
+        _to_json(route_points),
+        _ROUTE_SAFETY_TEMPLATE[1],
+        _to_json(crime_data),
+        _ROUTE_SAFETY_TEMPLATE[2],
+        time_of_day,
+        _ROUTE_SAFETY_TEMPLATE[3]
+    ))
\ No newline at end of file
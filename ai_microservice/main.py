@@ -28,5 +28,7 @@ if __name__ == "__main__":
         "app.api.routes:app",
         host=settings.HOST,
         port=settings.PORT,
-        reload=True
+        loop=settings.UVICORN_LOOP,
+        http=settings.UVICORN_HTTP,
+        reload=settings.RELOAD
     )
\ No newline at end of file
@@ -7,14 +7,19 @@ import subprocess
 
 
 def run_unit_tests():
-    """Run only unit tests"""
+    """Run only unit tests, across PYTEST_WORKERS xdist workers when it is set"""
     print("Running unit tests...")
-    result = subprocess.run(["pytest", "-v", "--ignore=tests/integration"])
+    args = ["pytest", "-v", "-m", "not integration", "tests"]
+    # Worker startup costs more than the current suite, so parallelism is opt-in
+    workers = os.environ.get("PYTEST_WORKERS")
+    if workers:
+        args[2:2] = ["-n", workers]
+    result = subprocess.run(args)
     return result.returncode
 
 
 def run_integration_tests():
-    """Run only integration tests"""
+    """Run only integration tests, serially against the running service"""
     print("Running integration tests...")
     result = subprocess.run(["pytest", "-v", "-m", "integration", "tests/integration"])
     return result.returncode
@@ -23,20 +28,21 @@ def run_integration_tests():
 def run_all_tests():
     """Run all tests including integration tests"""
     print("Running all tests...")
-    result = subprocess.run(["pytest", "-v"])
-    return result.returncode
+    returncode = run_unit_tests()
+    return run_integration_tests() or returncode
 
 
-def run_specific_test(test_path):
-    """Run a specific test file or directory"""
-    print(f"Running specific test: {test_path}")
-    result = subprocess.run(["pytest", "-v", test_path])
+def run_specific_tests(test_paths):
+    """Run specific test files or directories in a single pytest session"""
+    print(f"Running specific tests: {' '.join(test_paths)}")
+    result = subprocess.run(["pytest", "-v", *test_paths])
     return result.returncode
 
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        print("Usage: python run_tests.py [unit|integration|all|path/to/test]")
+        print("Usage: python run_tests.py [unit|integration|all|path/to/test ...]")
+        print("Set PYTEST_WORKERS (e.g. auto or 4) to run unit tests in parallel")
         sys.exit(1)
     
     command = sys.argv[1].lower()
@@ -48,5 +54,5 @@ if __name__ == "__main__":
     elif command == "all":
         sys.exit(run_all_tests())
     else:
-        # Assume it's a path to a specific test file or directory
-        sys.exit(run_specific_test(sys.argv[1]))
\ No newline at end of file
+        # Assume they're paths to test files or directories; collect them in one run
+        sys.exit(run_specific_tests(sys.argv[1:]))
\ No newline at end of file
@@ -1,57 +1,116 @@
 import os
 import sys
+import httpx
+import orjson
 import pytest
 import pytest_asyncio
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from fastapi.testclient import TestClient
-from httpx import AsyncClient, ASGITransport
+from httpx import AsyncClient, ASGITransport, Timeout
 
 # Ensure the 'ai_microservice' directory is in the PYTHONPATH
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # Parent of 'tests'
 sys.path.insert(0, BASE_DIR)
 
-from app.api.routes import app
+from app.api.routes import app, get_movement_service, get_route_safety_service
+from app.services.movement import MovementAnalysisService
+from app.services.route_safety import RouteSafetyService
 from tests.test_data import SAMPLE_MOVEMENT_RESPONSE, SAMPLE_ROUTE_RESPONSE
 
 
+@pytest.fixture(scope="session")
+def anyio_backend():
+    """Pin anyio-based tests to asyncio so they never expand to other backends"""
+    return "asyncio"
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _orjson_responses():
+    """Decode httpx response bodies with orjson for the whole session"""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(httpx.Response, "json", lambda self, **kwargs: orjson.loads(self.content))
+        yield
+
+
 @pytest.fixture
 def test_client():
     """Return a TestClient instance for testing synchronous endpoints"""
     return TestClient(app)
 
 
-@pytest_asyncio.fixture
+@pytest_asyncio.fixture(scope="session")
 async def async_client():
-    """Return an AsyncClient instance for testing asynchronous endpoints"""
-    print("Initializing AsyncClient...")  # Debug
-    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-        print(f"AsyncClient initialized: {client}, Type: {type(client)}")
+    """Return an in-process AsyncClient shared by all asynchronous endpoint tests"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test", timeout=Timeout(2.0)) as client:
         yield client
-    print("AsyncClient closed.")  # Debug
+
+
+@pytest.fixture(scope="session")
+def movement_service():
+    """Create one real movement analysis service for the whole session"""
+    return MovementAnalysisService()
+
+
+@pytest.fixture(scope="session")
+def route_safety_service():
+    """Create one real route safety service for the whole session"""
+    return RouteSafetyService()
 
 
 @pytest.fixture
-def mock_movement_service():
-    """Create a mock movement analysis service"""
-    with patch("app.api.routes.MovementAnalysisService") as mock_service:
-        instance = mock_service.return_value
-        instance.analyze_movement = AsyncMock(return_value=SAMPLE_MOVEMENT_RESPONSE)
-        yield instance
+def fast_movement_service(monkeypatch, mock_ai_service):
+    """Create a movement service without building a real AI client"""
+    monkeypatch.setattr(MovementAnalysisService, "__init__", lambda self: None)
+    service = MovementAnalysisService()
+    service.ai_service = mock_ai_service
+    return service
 
 
 @pytest.fixture
+def fast_route_safety_service(monkeypatch, mock_ai_service):
+    """Create a route safety service without building a real AI client"""
+    monkeypatch.setattr(RouteSafetyService, "__init__", lambda self: None)
+    service = RouteSafetyService()
+    service.ai_service = mock_ai_service
+    return service
+
+
+@pytest.fixture(scope="session")
+def mock_movement_service():
+    """Create a mock movement analysis service shared by the whole session"""
+    instance = MagicMock()
+    instance.analyze_movement = AsyncMock()
+    app.dependency_overrides[get_movement_service] = lambda: instance
+    yield instance
+    app.dependency_overrides.pop(get_movement_service, None)
+
+
+@pytest.fixture(scope="session")
 def mock_route_service():
-    """Create a mock route safety service"""
-    with patch("app.api.routes.RouteSafetyService") as mock_service:
-        instance = mock_service.return_value
-        instance.analyze_route_safety = AsyncMock(return_value=SAMPLE_ROUTE_RESPONSE)
-        yield instance
+    """Create a mock route safety service shared by the whole session"""
+    instance = MagicMock()
+    instance.analyze_route_safety = AsyncMock()
+    app.dependency_overrides[get_route_safety_service] = lambda: instance
+    yield instance
+    app.dependency_overrides.pop(get_route_safety_service, None)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_ai_service():
     """Create a mock AI service for service layer tests"""
     with patch("app.services.ai_service.AIService") as mock_service_class:
         instance = mock_service_class.return_value
-        instance.get_analysis = AsyncMock(return_value={})
-        yield instance
\ No newline at end of file
+        instance.get_analysis = AsyncMock()
+        yield instance
+
+
+@pytest.fixture(autouse=True)
+def _reset_mocks(mock_movement_service, mock_route_service, mock_ai_service):
+    """Give every test freshly configured mocks without rebuilding them"""
+    for mock in (mock_movement_service, mock_route_service, mock_ai_service):
+        mock.reset_mock(return_value=True, side_effect=True)
+    
+    mock_movement_service.analyze_movement.return_value = SAMPLE_MOVEMENT_RESPONSE
+    mock_route_service.analyze_route_safety.return_value = SAMPLE_ROUTE_RESPONSE
+    mock_ai_service.get_analysis.return_value = {}
+    yield
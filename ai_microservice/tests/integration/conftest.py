@@ -3,17 +3,25 @@ Configuration for integration tests
 """
 import os
 import pytest
-from httpx import AsyncClient, Timeout
+import pytest_asyncio
+from httpx import AsyncClient, Limits, Timeout
 
+_INTEGRATION_TIMEOUT = Timeout(connect=5.0, read=10.0, write=10.0, pool=5.0)
+_INTEGRATION_LIMITS = Limits(max_keepalive_connections=20, keepalive_expiry=60)
 
-@pytest.fixture
+
+@pytest.fixture(scope="session")
 def api_base_url():
     """Get the base URL for integration tests from environment variable or use default"""
     return os.getenv("API_TEST_URL", "http://localhost:3002")
 
 
-@pytest.fixture
+@pytest_asyncio.fixture(scope="session")
 async def api_client(api_base_url):
-    """Create a client for integration testing against a running service"""
-    async with AsyncClient(base_url=api_base_url, timeout=Timeout(timeout=600.0)) as client:
-        yield client
\ No newline at end of file
+    """Create a client shared by all integration tests against a running service"""
+    async with AsyncClient(
+        base_url=api_base_url,
+        limits=_INTEGRATION_LIMITS,
+        timeout=_INTEGRATION_TIMEOUT
+    ) as client:
+        yield client
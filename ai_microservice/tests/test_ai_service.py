@@ -0,0 +1,165 @@
+"""
+Tests for the Gemini AI service
+"""
+import asyncio
+import httpx
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from app.core.config import settings
+from app.core.http import get_http_client
+from app.services import ai_service
+from app.services.ai_service import AIService, InFlightRequests, llm_cache
+
+
+def make_stream(*texts):
+    """Build a fake generate_content_stream result yielding the given text chunks"""
+    consumed = []
+    
+    async def stream():
+        for text in texts:
+            consumed.append(text)
+            yield SimpleNamespace(text=text)
+    
+    return stream(), consumed
+
+
+async def test_get_analysis_stops_streaming_after_json():
+    """Test that streaming stops as soon as the JSON object is complete"""
+    service = AIService()
+    stream, consumed = make_stream('```json\n{"risk_level": ', '6, "reasoning": "a}b"}', '\n```', '\n')
+    
+    with patch.object(service.client.aio.models, "generate_content_stream", AsyncMock(return_value=stream)) as mock_stream:
+        result = await service.get_analysis("system", "user")
+    
+    assert result == {"risk_level": 6, "reasoning": "a}b"}
+    assert len(consumed) == 2
+    # The system prompt travels separately so it can be cached by the provider
+    call_kwargs = mock_stream.call_args.kwargs
+    assert call_kwargs["contents"] == "user"
+    assert call_kwargs["config"].system_instruction == "system"
+
+
+async def test_get_analysis_falls_back_to_full_response():
+    """Test that an unparseable stream falls back to a non-streaming request"""
+    service = AIService()
+    stream, _ = make_stream('{"risk_level": oops}')
+    response = SimpleNamespace(text='{"risk_level": 4}')
+    
+    with patch.object(service.client.aio.models, "generate_content_stream", AsyncMock(return_value=stream)), \
+            patch.object(service.client.aio.models, "generate_content", AsyncMock(return_value=response)) as mock_generate:
+        result = await service.get_analysis("system", "user")
+    
+    assert result == {"risk_level": 4}
+    mock_generate.assert_called_once()
+
+
+
+
+async def test_get_analysis_applies_request_timeout(monkeypatch):
+    """Test that requests built by the SDK carry the configured HTTP timeout"""
+    service = AIService()
+    sent = []
+    
+    async def send(request, **kwargs):
+        sent.append(request)
+        body = {"candidates": [{"content": {"parts": [{"text": '{"risk_level": 3}'}]}}]}
+        return httpx.Response(200, json=body, request=request)
+    
+    monkeypatch.setattr(get_http_client(), "send", send)
+    await service.client.aio.models.generate_content(model=service.model, contents="user")
+    
+    timeout = sent[0].extensions["timeout"]
+    assert timeout["read"] == settings.HTTP_REQUEST_TIMEOUT
+
+async def test_get_analysis_times_out_waiting_for_slot(monkeypatch):
+    """Test that a request raises instead of waiting forever when every slot is held"""
+    monkeypatch.setattr(ai_service, "_GEMINI_SEMAPHORE", asyncio.Semaphore(0))
+    monkeypatch.setattr(ai_service, "_GEMINI_CALL_TIMEOUT", 0.01)
+    service = AIService()
+    
+    with patch.object(service.client.aio.models, "generate_content_stream", AsyncMock()) as mock_stream:
+        with pytest.raises(asyncio.TimeoutError):
+            await service.get_analysis("system", "user", temperature=0.3)
+    
+    mock_stream.assert_not_called()
+
+async def test_get_analysis_uses_cache():
+    """Test that identical low-temperature requests only reach the model once"""
+    llm_cache.clear()
+    service = AIService()
+    mock_stream = AsyncMock(side_effect=lambda **kwargs: make_stream('{"risk_level": 6}')[0])
+    
+    with patch.object(service.client.aio.models, "generate_content_stream", mock_stream):
+        first = await service.get_analysis("system", "user", temperature=0.0)
+        second = await service.get_analysis("system", "user", temperature=0.0)
+    
+    assert first == second == {"risk_level": 6}
+    mock_stream.assert_called_once()
+    llm_cache.clear()
+
+
+async def test_get_analysis_skips_cache_for_sampled_requests():
+    """Test that higher-temperature requests always reach the model"""
+    llm_cache.clear()
+    service = AIService()
+    mock_stream = AsyncMock(side_effect=lambda **kwargs: make_stream('{"risk_level": 6}')[0])
+    
+    with patch.object(service.client.aio.models, "generate_content_stream", mock_stream):
+        await service.get_analysis("system", "user", temperature=0.3)
+        await service.get_analysis("system", "user", temperature=0.3)
+    
+    assert mock_stream.call_count == 2
+    assert llm_cache.stats()["size"] == 0
+
+
+async def test_in_flight_requests_share_identical_calls():
+    """Test that concurrent identical requests share a single call"""
+    in_flight = InFlightRequests()
+    calls = []
+    
+    async def call(value):
+        calls.append(value)
+        return {"value": value}
+    
+    results = await asyncio.gather(
+        in_flight.submit("a", lambda: call("a")),
+        in_flight.submit("a", lambda: call("a")),
+        in_flight.submit("b", lambda: call("b"))
+    )
+    
+    assert [result["value"] for result in results] == ["a", "a", "b"]
+    assert sorted(calls) == ["a", "b"]
+    assert results[0] is not results[1]
+
+
+async def test_in_flight_requests_propagate_errors():
+    """Test that a failing call raises in every waiting caller"""
+    in_flight = InFlightRequests()
+    
+    async def fail():
+        raise RuntimeError("provider down")
+    
+    results = await asyncio.gather(
+        in_flight.submit("a", fail),
+        in_flight.submit("a", fail),
+        return_exceptions=True
+    )
+    
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+async def test_in_flight_requests_forget_finished_calls():
+    """Test that a request made after the shared call finishes reaches the model again"""
+    in_flight = InFlightRequests()
+    calls = []
+    
+    async def call():
+        calls.append(1)
+        return {}
+    
+    await in_flight.submit("a", call)
+    await in_flight.submit("a", call)
+    
+    assert len(calls) == 2
@@ -1,6 +1,8 @@
 """
 Shared test data for all test modules
 """
+import orjson
+from types import MappingProxyType
 
 # Test request data
 SAMPLE_MOVEMENT_REQUEST = {
@@ -27,6 +29,17 @@ SAMPLE_ROUTE_REQUEST = {
     "user_id": "test-user-123"
 }
 
+# Invalid requests missing required fields
+INVALID_MOVEMENT_REQUEST = {"historical_data": []}  # Missing current_data and user_id
+INVALID_ROUTE_REQUEST = {"route_points": []}  # Missing crime_data, time_of_day, and user_id
+
+# Request bodies serialized once so tests don't re-encode them per call
+SAMPLE_MOVEMENT_REQUEST_BYTES = orjson.dumps(SAMPLE_MOVEMENT_REQUEST)
+SAMPLE_ROUTE_REQUEST_BYTES = orjson.dumps(SAMPLE_ROUTE_REQUEST)
+INVALID_MOVEMENT_REQUEST_BYTES = orjson.dumps(INVALID_MOVEMENT_REQUEST)
+INVALID_ROUTE_REQUEST_BYTES = orjson.dumps(INVALID_ROUTE_REQUEST)
+JSON_HEADERS = {"content-type": "application/json"}
+
 # Test response data
 SAMPLE_MOVEMENT_RESPONSE = {
     "abnormal_speed": True,
@@ -55,4 +68,8 @@ SAMPLE_ROUTE_RESPONSE = {
     "safe_alternative_available": True,
     "analysis_timestamp": "2025-01-01T12:16:00",
     "user_id": "test-user-123"
-}
\ No newline at end of file
+}
+
+# Read-only views so any code path that mutates a shared response fails loudly
+SAMPLE_MOVEMENT_RESPONSE = MappingProxyType(SAMPLE_MOVEMENT_RESPONSE)
+SAMPLE_ROUTE_RESPONSE = MappingProxyType(SAMPLE_ROUTE_RESPONSE)
@@ -2,6 +2,9 @@
 Tests for the health check endpoint
 """
 import pytest
+from fastapi.testclient import TestClient
+
+from app.api.routes import app, get_movement_service
 
 
 def test_health_check(test_client):
@@ -11,4 +14,12 @@ def test_health_check(test_client):
     assert response.status_code == 200
     data = response.json()
     assert data["status"] == "healthy"
-    assert data["service"] == "ai-microservice"
\ No newline at end of file
+    assert data["service"] == "ai-microservice"
+
+def test_shutdown_releases_cached_services():
+    """Test that services cached during one app lifespan are not reused after shutdown"""
+    with TestClient(app):
+        first = get_movement_service()
+    
+    # The old service's Gemini client is bound to the closed pool, so a fresh one is built
+    assert get_movement_service() is not first
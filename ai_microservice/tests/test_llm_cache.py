@@ -0,0 +1,33 @@
+"""
+Tests for the LLM response cache
+"""
+from app.utils.llm_cache import LLMCache
+
+
+async def test_cache_returns_copy():
+    """Test that cached results are isolated from caller mutation"""
+    cache = LLMCache(maxsize=4, ttl=60)
+    key = LLMCache.make_key("model", "system", "user", 0.0)
+    
+    assert await cache.get(key) is None
+    await cache.set(key, {"risk_level": 3})
+    
+    result = await cache.get(key)
+    result["user_id"] = "someone"
+    
+    assert await cache.get(key) == {"risk_level": 3}
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["size"] == 1
+
+
+def test_cache_key_depends_on_inputs():
+    """Test that any change in the request produces a different key"""
+    key = LLMCache.make_key("model", "system", "user", 0.0)
+    
+    assert key == LLMCache.make_key("model", "system", "user", 0.0)
+    assert key != LLMCache.make_key("other-model", "system", "user", 0.0)
+    assert key != LLMCache.make_key("model", "system", "user", 0.05)
+    assert key != LLMCache.make_key("model", "system", "other-user", 0.0)
+
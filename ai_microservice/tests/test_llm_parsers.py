@@ -0,0 +1,57 @@
+"""
+Tests for the model response parsers
+"""
+import pytest
+
+from app.utils.llm_parsers import extract_json_from_model_response
+
+
+def test_extract_json_from_code_block():
+    """Test extraction from a fenced json block"""
+    response = 'Here you go:\n```json\n{"risk_level": 3, "abnormal_speed": false}\n```'
+    
+    result = extract_json_from_model_response(response)
+    
+    assert result == {"risk_level": 3, "abnormal_speed": False}
+
+
+def test_extract_json_strips_thinking():
+    """Test that <think> sections are ignored"""
+    response = '<think>maybe {"risk_level": 9}</think>\n{"risk_level": 2}'
+    
+    result = extract_json_from_model_response(response)
+    
+    assert result == {"risk_level": 2}
+
+
+def test_extract_json_bare_object():
+    """Test extraction of an object surrounded by prose"""
+    response = 'Analysis: {"safety_score": 7, "risky_segments": []} Done.'
+    
+    result = extract_json_from_model_response(response)
+    
+    assert result == {"safety_score": 7, "risky_segments": []}
+
+
+def test_extract_json_invalid():
+    """Test that malformed or missing JSON raises ValueError"""
+    with pytest.raises(ValueError):
+        extract_json_from_model_response("No structured output here")
+    
+    with pytest.raises(ValueError):
+        extract_json_from_model_response('{"risk_level": }')
+
+
+def test_extract_json_ignores_trailing_text_with_braces():
+    """Test that only the first balanced object is parsed"""
+    response = '{"risk_level": 4, "reasoning": "saw } and {"} Note: {not json}'
+    
+    result = extract_json_from_model_response(response)
+    
+    assert result == {"risk_level": 4, "reasoning": "saw } and {"}
+
+
+def test_extract_json_unbalanced_object():
+    """Test that a truncated object raises ValueError"""
+    with pytest.raises(ValueError):
+        extract_json_from_model_response('{"risk_level": 4, "reasoning": "cut off')
@@ -2,13 +2,12 @@
 Tests for the route safety endpoint
 """
 import pytest
-from tests.test_data import SAMPLE_ROUTE_REQUEST
+from tests.test_data import INVALID_ROUTE_REQUEST_BYTES, JSON_HEADERS, SAMPLE_ROUTE_REQUEST, SAMPLE_ROUTE_REQUEST_BYTES
 
 
-@pytest.mark.asyncio
 async def test_evaluate_route_safety(async_client, mock_route_service):
     """Test that the route safety endpoint processes requests correctly"""
-    response = await async_client.post("/analyze/route-safety", json=SAMPLE_ROUTE_REQUEST)
+    response = await async_client.post("/analyze/route-safety", content=SAMPLE_ROUTE_REQUEST_BYTES, headers=JSON_HEADERS)
     
     # Check response
     assert response.status_code == 200
@@ -26,33 +25,24 @@ async def test_evaluate_route_safety(async_client, mock_route_service):
     )
 
 
-@pytest.mark.asyncio
-async def test_evaluate_route_safety_error(async_client, mock_route_service):
+@pytest.mark.parametrize(
+    "side_effect, expected_status, payload",
+    [
+        (Exception("Test error"), 500, SAMPLE_ROUTE_REQUEST_BYTES),
+        (None, 422, INVALID_ROUTE_REQUEST_BYTES),
+    ],
+    ids=["service-error", "validation-error"]
+)
+async def test_evaluate_route_safety_error(async_client, mock_route_service, side_effect, expected_status, payload):
     """Test error handling in the route safety endpoint"""
-    # Configure mock to raise an exception
-    mock_route_service.analyze_route_safety.side_effect = Exception("Test error")
+    # Configure mock to raise an exception (if any)
+    mock_route_service.analyze_route_safety.side_effect = side_effect
     
-    response = await async_client.post("/analyze/route-safety", json=SAMPLE_ROUTE_REQUEST)
+    response = await async_client.post("/analyze/route-safety", content=payload, headers=JSON_HEADERS)
     
     # Check error response
-    assert response.status_code == 500
+    assert response.status_code == expected_status
     data = response.json()
     assert "detail" in data
-    assert "Test error" in data["detail"]
-
-
-@pytest.mark.asyncio
-async def test_evaluate_route_safety_validation_error(async_client):
-    """Test validation error handling for invalid requests"""
-    # Create an invalid request missing required fields
-    invalid_request = {
-        "route_points": [],
-        # Missing crime_data, time_of_day, and user_id
-    }
-    
-    response = await async_client.post("/analyze/route-safety", json=invalid_request)
-    
-    # Check validation error response
-    assert response.status_code == 422
-    data = response.json()
-    assert "detail" in data
\ No newline at end of file
+    if side_effect is not None:
+        assert str(side_effect) in data["detail"]